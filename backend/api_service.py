@@ -2,8 +2,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from notebook_summerizer import ns
-from ollama_summerizer import local_ollama
+from providers import get_provider, enabled_providers, provider_error, ProviderError
 from pathlib import Path
 import os, time, subprocess
 from fastapi import HTTPException
@@ -28,13 +27,16 @@ NOTEBOOKS_DIR = BACKEND_DIR / "notebooks"
 LOGS_DIR = BACKEND_DIR / "notebooklogs/notebook_experiments"                 
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 LOGS_SYS_DIR = BACKEND_DIR / "notebooklogs/notebook_logs"
+BLOBS_DIR = BACKEND_DIR / "notebooklogs/blobs"   # kept outside LOGS_DIR so /getLogs stays log-only
 SUM_LOGS_DIR = "notebooklogs/notebook_experiments" 
+MAX_TIMING_TOP = 100   # cap for /analytics/timing?top= and ?limit=
 RUN_STATE = {"proc": None, "notebook": None, "started_at": None, "log_file": None}
 
 class TrackitRunRequest(BaseModel):
     notebook: str
     json: bool = False
     debounce: float = 0.5
+    thumbnails: bool = False
 
 def _is_running():
     p = RUN_STATE["proc"]
@@ -49,6 +51,14 @@ def _ensure_notebook(name: str):
         raise HTTPException(404, f"Notebook not found: {name}")
     return nb
 
+def _ensure_log(name: str):
+    log = Path(LOGS_DIR / name).resolve()
+    if LOGS_DIR.resolve() not in log.parents:
+        raise HTTPException(400, "Invalid log path.")
+    if not log.is_file():
+        raise HTTPException(404, f"Log not found: {name}")
+    return log
+
 class FileRequest(BaseModel):
     filename: str
     provider: str 
@@ -69,30 +79,30 @@ def get_summary(request: FileRequest):
         filename = request.filename
         provider = request.provider
         
-        if provider == "bedrock":
-            print('Running AWS Model')
-            try:
-                notebook_filename = SUM_LOGS_DIR + "/" + filename
-                note_summary_object = ns(notebook_filename)
-                summary = note_summary_object.driver()
-                return summary
-            except: 
-                return "Ran into some issues runing inference on AWS Bedrock. Please check evironment variables or Try local Ollama Option"
-        elif provider == "local":
-            print('Running local model')
-            try:
-                notebook_filename = SUM_LOGS_DIR + "/" + filename
-                note_summary_object = local_ollama(notebook_filename)
-                summary = note_summary_object.driver()
-                return summary
-
-            except:
-                return "Ran into some issues runing inference on local models."
-            
+        try:
+            summarizer = get_provider(provider)
+        except ProviderError as e:
+            return str(e)
+        except ImportError:
+            return provider_error(provider)
+
+        print(f'Running provider: {provider}')
+        try:
+            notebook_filename = SUM_LOGS_DIR + "/" + filename
+            note_summary_object = summarizer(notebook_filename)
+            summary = note_summary_object.driver()
+            return summary
+        except:
+            return provider_error(provider)
 
     except Exception as e:
         return str(e)
 
+## Providers that can be used for /summary on this server
+@app.get("/providers")
+def get_providers():
+    return enabled_providers()
+
 ## Getting logs
 @app.get("/getLogs")
 def get_log_files():
@@ -117,6 +127,25 @@ def get_notebooks():
     except FileNotFoundError:
         return {"error": f"Folder '{folder}' not found"}
 
+## Execution-timing analytics for a tracked log
+@app.get("/analytics/timing")
+def get_timing_analytics(filename: str, top: int = 10, limit: int = MAX_TIMING_TOP, since: str = None):
+    # imported here so pandas is only loaded by workers that serve analytics
+    from notebook_analytics import get_timing_report
+
+    if top < 1 or limit < 1:
+        raise HTTPException(400, "top and limit must be at least 1.")
+    top = min(top, MAX_TIMING_TOP)
+    limit = min(limit, MAX_TIMING_TOP)
+
+    log_path = _ensure_log(filename)
+    try:
+        return get_timing_report(log_path, top_n=top, limit=limit, since=since)
+    except ValueError as e:
+        raise HTTPException(400, f"Invalid since timestamp: {e}")
+    except Exception as e:
+        raise HTTPException(500, f"Failed to compute timing analytics: {e}")
+
 ### Tracking Endpoints 
 @app.get("/trackit/status")
 def trackit_status():
@@ -151,6 +180,8 @@ def trackit_run(req: TrackitRunRequest):
     if req.json: cmd.append("--json")
     if req.debounce != 0.5:
         cmd.extend(["--debounce", str(req.debounce)])
+    if req.thumbnails:
+        cmd.extend(["--blob-dir", str(BLOBS_DIR)])
 
     f = open(proc_stdout, "a", encoding="utf-8")
     try:
@@ -0,0 +1,64 @@
+# bench_startup.py
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+# Modules that must stay out of a cold `import api_service` (loaded lazily on first use)
+HEAVY_MODULES = ["boto3", "botocore", "requests", "pandas", "notebook_summerizer", "ollama_summerizer", "notebook_analytics"]
+
+PROBE = (
+    "import sys, time, json\n"
+    "t0 = time.perf_counter()\n"
+    "import api_service\n"
+    "elapsed = (time.perf_counter() - t0) * 1000\n"
+    "heavy = [m for m in {heavy!r} if m in sys.modules]\n"
+    "print(json.dumps({{'ms': elapsed, 'heavy': heavy}}))\n"
+)
+
+def measure_once():
+    """Imports api_service in a fresh interpreter; returns (ms, heavy modules loaded)."""
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=str(BACKEND_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    return result["ms"], result["heavy"]
+
+def parse_args():
+    ap = argparse.ArgumentParser(description="Measure cold-start import time of the API service.")
+    ap.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to time.")
+    ap.add_argument("--target-ms", type=float, default=float(os.getenv("TRACKIT_IMPORT_TARGET_MS", "800")),
+                    help="Fail when the median import time exceeds this many milliseconds.")
+    return ap.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    timings = []
+    heavy = set()
+    for _ in range(args.runs):
+        ms, loaded = measure_once()
+        timings.append(ms)
+        heavy.update(loaded)
+
+    median = statistics.median(timings)
+    print(f"[bench] import api_service: median {median:.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms over {args.runs} run(s)")
+    print(f"[bench] target: {args.target_ms:.0f} ms")
+
+    failed = False
+    if heavy:
+        print(f"[bench] FAIL: heavy modules imported at startup: {', '.join(sorted(heavy))}")
+        failed = True
+    if median > args.target_ms:
+        print("[bench] FAIL: cold start is over target")
+        failed = True
+
+    sys.exit(1 if failed else 0)
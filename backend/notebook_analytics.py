@@ -0,0 +1,227 @@
+import json
+import re
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+
+# Header lines written by trackit3._append_text, e.g. "- cell_id: abc123"
+SNAPSHOT_HEADER = "# Snapshot "
+HEADER_FIELD = re.compile(r"^- (\w+): (.*)$")
+TEXT_FIELDS = {
+    "notebook_path": "notebook_path",
+    "cell_index": "cell_index",
+    "cell_id": "cell_id",
+    "exec_count": "execution_count",
+    "exec_start": "exec_start",
+    "exec_end": "exec_end",
+}
+COLUMNS = ["event_time", "notebook_path", "cell_index", "cell_id", "execution_count", "exec_start", "exec_end"]
+
+
+class timing_analytics:
+    """
+    Execution-duration statistics over a trackit3 log (text or JSON Lines).
+
+    The log is append-only, so records are read incrementally from the last
+    byte offset and the computed report is reused until new records arrive.
+    """
+
+    def __init__(self, log_path, regression_ratio=1.5, regression_min_sec=1.0):
+        self.log_path = Path(log_path)
+        self.regression_ratio = regression_ratio
+        self.regression_min_sec = regression_min_sec
+
+        self.is_jsonl = None
+        self.offset = 0      # start of the next unconsumed record
+        self.read_to = 0     # end of the bytes already seen
+        self.records = []
+        self.tail = []       # text mode: last snapshot, re-parsed until the next one starts
+        self.frame = None
+        self.report = None
+        self.regression_frame = None
+        self.lock = threading.Lock()   # one report computation per log at a time
+
+    # ---------- Loading ----------
+    def _parse_jsonl(self, text):
+        rows = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            rows.append({c: rec.get(c) for c in COLUMNS})
+        return rows
+
+    def _parse_text(self, text):
+        rows = []
+        current = None
+        for line in text.splitlines():
+            if line.startswith(SNAPSHOT_HEADER):
+                current = {c: None for c in COLUMNS}
+                current["event_time"] = line[len(SNAPSHOT_HEADER):].strip()
+                rows.append(current)
+                continue
+            if current is None:
+                continue
+            if line.startswith("## Input:"):
+                # header block finished; ignore cell bodies until the next snapshot
+                current = None
+                continue
+            m = HEADER_FIELD.match(line)
+            if m and m.group(1) in TEXT_FIELDS:
+                value = m.group(2).strip()
+                current[TEXT_FIELDS[m.group(1)]] = None if value == "None" else value
+        return rows
+
+    def refresh(self):
+        """Reads records appended since the last call. Returns True if new records arrived."""
+        size = self.log_path.stat().st_size
+        if size < self.read_to:
+            # log was truncated or replaced: start over
+            self.is_jsonl, self.offset, self.read_to = None, 0, 0
+            self.records, self.tail, self.frame, self.report = [], [], None, None
+        if size == self.read_to and self.frame is not None:
+            return False
+
+        start = self.offset
+        with self.log_path.open("rb") as f:
+            f.seek(start)
+            chunk = f.read()
+        # only consume whole lines; a partially flushed record is picked up next time
+        end = chunk.rfind(b"\n") + 1
+        if self.is_jsonl is None and chunk.strip():
+            self.is_jsonl = self.log_path.suffix == ".jsonl" or chunk.lstrip().startswith(b"{")
+        text = chunk[:end].decode("utf-8", errors="ignore")
+        changed = start + end > self.read_to
+        self.read_to = start + end
+
+        if self.is_jsonl:
+            self.records.extend(self._parse_jsonl(text))
+            self.offset += end
+        else:
+            # a read can stop inside a snapshot's header block, so the last snapshot
+            # is kept as `tail` and re-read from its header on the next call
+            header = SNAPSHOT_HEADER.encode("utf-8")
+            pos = chunk.rfind(b"\n" + header, 0, end)
+            last = pos + 1 if pos >= 0 else (0 if chunk.startswith(header) else None)
+            rows = self._parse_text(text)
+            if last is not None and rows:
+                self.records.extend(rows[:-1])
+                self.tail = rows[-1:]
+                self.offset += last
+            else:
+                self.records.extend(rows)
+                self.offset += end
+
+        if changed or self.frame is None:
+            self.frame = self._build_frame(self.records + self.tail)
+            self.report = None
+            return True
+        return False
+
+    def _build_frame(self, rows):
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df["exec_start"] = pd.to_datetime(df["exec_start"], utc=True, errors="coerce", format="ISO8601")
+        df["exec_end"] = pd.to_datetime(df["exec_end"], utc=True, errors="coerce", format="ISO8601")
+        df["cell_index"] = pd.to_numeric(df["cell_index"], errors="coerce").astype("Int64")
+        df["execution_count"] = pd.to_numeric(df["execution_count"], errors="coerce").astype("Int64")
+        df["duration_sec"] = (df["exec_end"] - df["exec_start"]).dt.total_seconds()
+
+        # one row per actual execution: output-only changes re-log the same run
+        df = df.dropna(subset=["duration_sec"])
+        df = df[df["duration_sec"] >= 0]
+        df = df.drop_duplicates(subset=["notebook_path", "cell_id", "exec_start"], keep="last")
+        return df.sort_values("exec_start").reset_index(drop=True)
+
+    # ---------- Statistics ----------
+    def per_cell(self, df):
+        grouped = df.groupby(["notebook_path", "cell_id"], sort=False)
+        stats = grouped["duration_sec"].agg(["count", "mean", "median", "min", "max", "sum"])
+        stats["last_sec"] = grouped["duration_sec"].last()
+        stats["cell_index"] = grouped["cell_index"].last()
+        stats = stats.rename(columns={"count": "runs", "sum": "total_sec"}).reset_index()
+        return stats.sort_values("total_sec", ascending=False)
+
+    def per_notebook(self, df):
+        grouped = df.groupby("notebook_path")
+        stats = grouped["duration_sec"].agg(["count", "mean", "median", "max", "sum"])
+        stats["p95_sec"] = grouped["duration_sec"].quantile(0.95)
+        stats["cells"] = grouped["cell_id"].nunique()
+        stats["first_start"] = grouped["exec_start"].min()
+        stats["last_end"] = grouped["exec_end"].max()
+        return stats.rename(columns={"count": "runs", "sum": "total_sec"}).reset_index()
+
+    def slowest(self, df, top_n):
+        return df.nlargest(top_n, "duration_sec")
+
+    def regressions(self, df):
+        prev = df.groupby(["notebook_path", "cell_id"])["duration_sec"].shift(1)
+        delta = df["duration_sec"] - prev
+        ratio = df["duration_sec"] / prev.where(prev > 0)
+        flagged = (ratio >= self.regression_ratio) & (delta >= self.regression_min_sec)
+        out = df.assign(previous_sec=prev, delta_sec=delta, ratio=ratio)[flagged]
+        return out.sort_values("delta_sec", ascending=False)
+
+    def timeline(self, df):
+        return df[["notebook_path", "cell_index", "cell_id", "execution_count", "exec_start", "exec_end", "duration_sec"]]
+
+    # ---------- Output ----------
+    def _records(self, df):
+        df = df.copy()
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = df[col].map(lambda t: t.isoformat() if pd.notna(t) else None)
+        df = df.astype(object).where(pd.notna(df), None)
+        return df.to_dict(orient="records")
+
+    def driver(self, top_n=10, limit=100, since=None):
+        """
+        Builds the report. `slowest` keeps the top_n longest runs; `regressions` (largest first)
+        and `timeline` (most recent last) keep at most `limit` runs started at or after `since`.
+        """
+        if since is not None:
+            since = pd.Timestamp(since)
+            since = since.tz_localize("UTC") if since.tzinfo is None else since.tz_convert("UTC")
+
+        with self.lock:
+            new_records = self.refresh()
+            df = self.frame
+            if self.report is None or new_records:
+                self.report = {
+                    "log_file": self.log_path.name,
+                    "runs": int(len(df)),
+                    "notebooks": self._records(self.per_notebook(df)),
+                    "cells": self._records(self.per_cell(df)),
+                }
+                self.regression_frame = self.regressions(df)
+            regressions = self.regression_frame
+
+        # per-request views are cut from the shared frames, so one parse serves every query
+        if since is not None:
+            df = df[df["exec_start"] >= since]
+            regressions = regressions[regressions["exec_start"] >= since]
+        return {
+            **self.report,
+            "slowest": self._records(self.slowest(df, top_n)),
+            "regressions": self._records(regressions.head(limit)),
+            "timeline": self._records(self.timeline(df).tail(limit)),
+        }
+
+
+# ---- one analytics instance per log file, reused across requests ----
+_ANALYTICS = {}
+_ANALYTICS_LOCK = threading.Lock()
+
+def get_timing_report(log_path, top_n=10, limit=100, since=None):
+    key = str(Path(log_path).resolve())
+    # global lock only guards the registry; each instance locks its own computation
+    with _ANALYTICS_LOCK:
+        analytics = _ANALYTICS.get(key)
+        if analytics is None:
+            analytics = _ANALYTICS[key] = timing_analytics(log_path)
+    return analytics.driver(top_n, limit, since)
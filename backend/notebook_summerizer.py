@@ -3,10 +3,6 @@ import boto3
 import json 
 import os 
 import re
-from dotenv import load_dotenv
-
-
-load_dotenv()
 
 
 class ns:
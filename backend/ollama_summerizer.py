@@ -1,9 +1,6 @@
 import os
 import re
 import requests
-from dotenv import load_dotenv
-
-load_dotenv()
 
 class local_ollama:
     def __init__(self, filename):
@@ -0,0 +1,73 @@
+import importlib
+import os
+import threading
+
+
+# ---- summarizer providers: name -> where to find it and what to say when it fails ----
+# Modules are imported on first use only, so e.g. boto3 is never loaded
+# by workers that only serve the local Ollama provider.
+PROVIDERS = {
+    "bedrock": {
+        "module": "notebook_summerizer",
+        "attr": "ns",
+        "error": "Ran into some issues runing inference on AWS Bedrock. Please check evironment variables or Try local Ollama Option",
+    },
+    "local": {
+        "module": "ollama_summerizer",
+        "attr": "local_ollama",
+        "error": "Ran into some issues runing inference on local models.",
+    },
+}
+
+# Comma-separated provider names to turn off, e.g. TRACKIT_DISABLED_PROVIDERS=bedrock
+DISABLED_ENV = "TRACKIT_DISABLED_PROVIDERS"
+
+_LOADED = {}
+_ENV_LOADED = False
+_LOCK = threading.Lock()
+
+
+class ProviderError(Exception):
+    pass
+
+
+def _load_env():
+    # .env is read once, on first provider lookup instead of at import time
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _ENV_LOADED = True
+
+
+def disabled_providers():
+    _load_env()
+    raw = os.getenv(DISABLED_ENV, "")
+    return {name.strip().lower() for name in raw.split(",") if name.strip()}
+
+
+def enabled_providers():
+    disabled = disabled_providers()
+    return [name for name in PROVIDERS if name not in disabled]
+
+
+def get_provider(name: str):
+    """
+    Returns the summarizer class registered under `name`, importing its module on first use.
+    Raises ProviderError for unknown or disabled providers.
+    """
+    spec = PROVIDERS.get(name)
+    if spec is None:
+        raise ProviderError(f"Unknown provider: {name}")
+    if name in disabled_providers():
+        raise ProviderError(f"Provider '{name}' is disabled on this server.")
+
+    with _LOCK:
+        if name not in _LOADED:
+            module = importlib.import_module(spec["module"])
+            _LOADED[name] = getattr(module, spec["attr"])
+        return _LOADED[name]
+
+
+def provider_error(name: str):
+    return PROVIDERS[name]["error"]
@@ -9,6 +9,10 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from datetime import datetime, timezone
 import hashlib
+import base64
+import re
+import struct
+from html.parser import HTMLParser
 from dotenv import load_dotenv
 
 
@@ -18,6 +22,24 @@ SHOULD_STOP = False
 # ---- in-run dedupe state: cell_id -> last digest ----
 LAST_DIGESTS = {}
 
+# ---- rich output handling (images / html), overridden from CLI args ----
+RICH_CONFIG = {
+    "images": True,            # record metadata for image/* payloads
+    "html": True,              # summarize text/html tables instead of text/plain
+    "blob_dir": None,          # content-addressed store for thumbnails (None = disabled)
+    "thumbnail_px": 128,       # max thumbnail edge in pixels
+    "html_max_rows": 5,        # table rows kept in the text summary
+    "html_max_cols": 8,        # table columns kept in the text summary
+}
+
+IMAGE_MIMES = ("image/png", "image/jpeg", "image/gif", "image/svg+xml")
+
+# ---- payload cache: sha256 of raw payload string -> image metadata (False = undecodable) ----
+# Lets unchanged images skip base64 decoding, hashing and blob writes on every save.
+# Pruned after each pass to the payloads still present in the notebook.
+PAYLOAD_CACHE = {}
+SEEN_PAYLOADS = set()
+
 def handle_signal(signum, frame):
     global SHOULD_STOP
     SHOULD_STOP = True
@@ -43,22 +65,254 @@ def _cell_digest(input_code: str, output_text: str):
     h.update((output_text or "").encode("utf-8"))
     return h.hexdigest()
 
+def _join(value):
+    return ''.join(value) if isinstance(value, list) else (value or '')
+
+def _image_dimensions(mime: str, raw: bytes):
+    """Read width/height straight from the image header (no image library needed)."""
+    try:
+        if mime == "image/png" and raw[:8] == b"\x89PNG\r\n\x1a\n":
+            return struct.unpack(">II", raw[16:24])
+        if mime == "image/gif" and raw[:4] == b"GIF8":
+            return struct.unpack("<HH", raw[6:10])
+        if mime == "image/jpeg" and raw[:2] == b"\xff\xd8":
+            i = 2
+            while i + 9 < len(raw):
+                if raw[i] != 0xFF:
+                    i += 1
+                    continue
+                marker = raw[i + 1]
+                if marker in (0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF):
+                    h, w = struct.unpack(">HH", raw[i + 5:i + 9])
+                    return w, h
+                i += 2 + struct.unpack(">H", raw[i + 2:i + 4])[0]
+        if mime == "image/svg+xml":
+            return _svg_dimensions(raw[:4096].decode("utf-8", errors="ignore"))
+    except (struct.error, ValueError):
+        pass
+    return None, None
+
+def _svg_size_attr(tag: str, name: str):
+    # absolute sizes only (unitless, px or pt); percentages/em give no pixel size
+    m = re.search(rf'(?<![\w-]){name}\s*=\s*["\']\s*([\d.]+)\s*(px|pt)?\s*["\']', tag)
+    if not m:
+        return None
+    value = float(m.group(1))
+    return round(value * 4 / 3) if m.group(2) == "pt" else round(value)
+
+def _svg_dimensions(text: str):
+    """Size of the root <svg> element: width/height attributes, else the viewBox."""
+    tag = re.search(r'<svg\b[^>]*>', text, re.IGNORECASE)
+    if not tag:
+        return None, None
+    tag = tag.group(0)
+    w, h = _svg_size_attr(tag, "width"), _svg_size_attr(tag, "height")
+    if w is not None and h is not None:
+        return w, h
+    vb = re.search(r'(?<![\w-])viewBox\s*=\s*["\']\s*[-\d.]+[\s,]+[-\d.]+[\s,]+([\d.]+)[\s,]+([\d.]+)', tag)
+    if vb:
+        return round(float(vb.group(1))), round(float(vb.group(2)))
+    return None, None
+
+def _store_thumbnail(raw: bytes, blob_dir: Path, max_px: int):
+    """
+    Writes a PNG thumbnail into the content-addressed blob store.
+    Returns the blob path, or None when Pillow is unavailable or decoding fails.
+    """
+    try:
+        from io import BytesIO
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        img = Image.open(BytesIO(raw))
+        img.thumbnail((max_px, max_px))
+        buf = BytesIO()
+        img.save(buf, format="PNG")
+    except Exception as e:
+        print(f"[trackit3] Could not build thumbnail: {e}")
+        return None
+
+    data = buf.getvalue()
+    digest = hashlib.sha256(data).hexdigest()
+    blob_path = blob_dir / digest[:2] / f"{digest}.png"
+    if not blob_path.exists():
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        blob_path.write_bytes(data)
+    return str(blob_path)
+
+def _image_metadata(mime: str, payload):
+    payload = _join(payload)
+    key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    SEEN_PAYLOADS.add(key)
+    cached = PAYLOAD_CACHE.get(key)
+    if cached is not None:
+        return cached or None
+
+    if mime == "image/svg+xml":
+        raw = payload.encode("utf-8")
+    else:
+        try:
+            raw = base64.b64decode(payload)
+        except (ValueError, TypeError):
+            PAYLOAD_CACHE[key] = False
+            return None
+
+    width, height = _image_dimensions(mime, raw)
+    meta = {
+        "mime": mime,
+        "bytes": len(raw),
+        "width": width,
+        "height": height,
+        "sha256": hashlib.sha256(raw).hexdigest(),
+        "thumbnail": None,
+    }
+    blob_dir = RICH_CONFIG.get("blob_dir")
+    if blob_dir and mime != "image/svg+xml":
+        meta["thumbnail"] = _store_thumbnail(raw, Path(blob_dir), RICH_CONFIG["thumbnail_px"])
+
+    PAYLOAD_CACHE[key] = meta
+    return meta
+
+def _format_image(meta: dict):
+    dims = f"{meta['width']}x{meta['height']}" if meta.get("width") else "?x?"
+    return f"[{meta['mime']} {dims}, {meta['bytes']} bytes, sha256:{meta['sha256'][:12]}]"
+
+class _TableParser(HTMLParser):
+    """
+    Collects every <table> in an HTML fragment as {"header": [...], "body": [...]} row lists.
+    Rows in <thead>, or made only of <th> cells outside <tbody>, count as header rows.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.tables = []
+        self._section = None
+        self._row = None
+        self._row_all_th = True
+        self._cell = None
+        self._colspan = 1
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.tables.append({"header": [], "body": []})
+            self._section = None
+        elif tag in ("thead", "tbody") and self.tables:
+            self._section = tag
+        elif tag == "tr" and self.tables:
+            self._row = []
+            self._row_all_th = True
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+            self._row_all_th = self._row_all_th and tag == "th"
+            try:
+                self._colspan = max(1, int(dict(attrs).get("colspan") or 1))
+            except ValueError:
+                self._colspan = 1
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            # repeat spanned cells so multi-level headers line up with their columns
+            self._row.extend([" ".join("".join(self._cell).split())] * self._colspan)
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if self._row:
+                is_header = self._section == "thead" or (self._section != "tbody" and self._row_all_th)
+                self.tables[-1]["header" if is_header else "body"].append(self._row)
+            self._row = None
+        elif tag in ("thead", "tbody"):
+            self._section = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+def _merge_header(rows):
+    """Joins multi-row headers (e.g. a pandas named index or MultiIndex) into one line per column."""
+    n_cols = max(len(r) for r in rows)
+    merged = []
+    for i in range(n_cols):
+        parts = []
+        for row in rows:
+            if i < len(row) and row[i] and (not parts or parts[-1] != row[i]):
+                parts.append(row[i])
+        merged.append(" ".join(parts))
+    return merged
+
+def _summarize_html(payload):
+    """
+    Converts HTML tables (e.g. pandas DataFrame reprs) into a compact text summary.
+    Returns None when the fragment contains no table.
+    """
+    parser = _TableParser()
+    try:
+        parser.feed(_join(payload))
+        parser.close()
+    except Exception:
+        return None
+
+    max_rows = RICH_CONFIG["html_max_rows"]
+    max_cols = RICH_CONFIG["html_max_cols"]
+    parts = []
+    for table in parser.tables:
+        header, body = table["header"], table["body"]
+        if not header and not body:
+            continue
+        n_cols = max(len(r) for r in header + body)
+        lines = [f"[table {len(body)} rows x {n_cols} cols]"]
+        rows = ([_merge_header(header)] if header else []) + body[:max_rows]
+        for row in rows:
+            cells = row[:max_cols] + (["..."] if len(row) > max_cols else [])
+            lines.append(" | ".join(cells))
+        if len(body) > max_rows:
+            lines.append(f"... ({len(body) - max_rows} more rows)")
+        parts.append("\n".join(lines))
+    return "\n".join(parts) if parts else None
+
+def _extract_rich_output(data: dict, rich: list):
+    """
+    Handles one mime bundle: appends image/html metadata to `rich`
+    and returns the text to log for it.
+    """
+    text = ''
+    handled_html = False
+    if RICH_CONFIG["html"] and 'text/html' in data:
+        html = _join(data['text/html'])
+        summary = _summarize_html(html)
+        if summary:
+            rich.append({"mime": "text/html", "bytes": len(html.encode("utf-8"))})
+            text += summary + "\n"
+            handled_html = True
+
+    if not handled_html and 'text/plain' in data:
+        text += _join(data['text/plain'])
+
+    if RICH_CONFIG["images"]:
+        for mime in IMAGE_MIMES:
+            if mime in data:
+                meta = _image_metadata(mime, data[mime])
+                if meta:
+                    rich.append(meta)
+                    text += ("\n" if text and not text.endswith("\n") else "") + _format_image(meta) + "\n"
+    return text
+
 def _extract_io_from_cell(cell):
     input_code = ''.join(cell.get('source', []) or [])
     outputs = cell.get('outputs', []) or []
 
-    # Collect text-like outputs
+    # Collect text-like outputs, plus metadata for rich (image/html) payloads
     output_text = ''
+    rich = []
     for output in outputs:
         if isinstance(output, dict):
             if 'text' in output:
                 output_text += ''.join(output['text'])
-            elif 'data' in output and isinstance(output['data'], dict) and 'text/plain' in output['data']:
-                output_text += ''.join(output['data']['text/plain'])
+            elif 'data' in output and isinstance(output['data'], dict):
+                output_text += _extract_rich_output(output['data'], rich)
             elif 'ename' in output and 'evalue' in output:
                 output_text += f"Error: {output.get('ename')}: {output.get('evalue')}\n"
 
-    return input_code.strip(), output_text.strip()
+    return input_code.strip(), output_text.strip(), rich
 
 def _extract_time_metadata(cell):
     meta = cell.get('metadata', {}) or {}
@@ -90,6 +344,11 @@ def _append_text(output_path: Path, record: dict):
     lines.append("")
     lines.append("## Output:")
     lines.append(record['output'])
+    thumbnails = [r["thumbnail"] for r in record.get("rich_outputs", []) if r.get("thumbnail")]
+    if thumbnails:
+        lines.append("")
+        lines.append("## Thumbnails:")
+        lines.extend(thumbnails)
     lines.append("\n")
     with output_path.open('a', encoding='utf-8') as f:
         f.write("\n".join(lines))
@@ -114,12 +373,13 @@ def extract_inputs_outputs(notebook_path: Path, output_path: Path, as_json=False
         notebook_mtime = None
 
     appended = 0
+    SEEN_PAYLOADS.clear()
     cells = notebook.get('cells', []) or []
     for idx, cell in enumerate(cells):
         if cell.get('cell_type') != 'code':
             continue
 
-        cell_input, cell_output = _extract_io_from_cell(cell)
+        cell_input, cell_output, rich_outputs = _extract_io_from_cell(cell)
         cid = _cell_id(cell, idx)
         digest = _cell_digest(cell_input, cell_output)
         if LAST_DIGESTS.get(cid) == digest:
@@ -139,6 +399,8 @@ def extract_inputs_outputs(notebook_path: Path, output_path: Path, as_json=False
             "input": cell_input,
             "output": cell_output,
         }
+        if rich_outputs:
+            record["rich_outputs"] = rich_outputs
 
         try:
             if as_json:
@@ -150,6 +412,10 @@ def extract_inputs_outputs(notebook_path: Path, output_path: Path, as_json=False
         except Exception as e:
             print(f"[trackit3] Error appending output: {e}")
 
+    # drop cached images that are no longer in the notebook
+    for key in set(PAYLOAD_CACHE) - SEEN_PAYLOADS:
+        del PAYLOAD_CACHE[key]
+
     print(f"[trackit3] Appended {appended} new cell snapshot(s) to {output_path}.")
     return appended
 
@@ -199,6 +465,12 @@ def parse_args():
     ap.add_argument("--json", action="store_true", help="Write output as JSON Lines (.jsonl), one record per cell.")
     ap.add_argument("--debounce", type=float, default=0.5, help="Debounce seconds for save events.")
     ap.add_argument("--once", action="store_true", help="Extract once and exit (no watching).")
+    ap.add_argument("--no-images", action="store_true", help="Skip metadata for image/* outputs.")
+    ap.add_argument("--no-html", action="store_true", help="Log text/plain instead of summarizing text/html tables.")
+    ap.add_argument("--blob-dir", default=None, help="Directory for content-addressed image thumbnails (requires Pillow).")
+    ap.add_argument("--thumbnail-px", type=int, default=128, help="Max thumbnail edge in pixels.")
+    ap.add_argument("--html-max-rows", type=int, default=5, help="Table rows kept in html summaries.")
+    ap.add_argument("--html-max-cols", type=int, default=8, help="Table columns kept in html summaries.")
     return ap.parse_args()
 
 if __name__ == "__main__":
@@ -206,6 +478,20 @@ if __name__ == "__main__":
     NOTEBOOK_PATH = Path(args.notebook).resolve()
     OUTPUT_PATH = Path(args.output).resolve()
     AS_JSON = bool(args.json)
+    RICH_CONFIG.update({
+        "images": not args.no_images,
+        "html": not args.no_html,
+        "blob_dir": str(Path(args.blob_dir).resolve()) if args.blob_dir else None,
+        "thumbnail_px": args.thumbnail_px,
+        "html_max_rows": args.html_max_rows,
+        "html_max_cols": args.html_max_cols,
+    })
+    if RICH_CONFIG["blob_dir"]:
+        try:
+            import PIL
+        except ImportError:
+            print("[trackit3] Warning: --blob-dir needs Pillow (pip install Pillow); thumbnails are disabled.")
+            RICH_CONFIG["blob_dir"] = None
 
     if not NOTEBOOK_PATH.exists():
         print(f"[trackit3] Notebook not found: {NOTEBOOK_PATH}")